@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect, useLayoutEffect, useMemo, useRef } from 'react';
 import { motion, AnimatePresence, Reorder } from 'framer-motion';
 import { Plus, ChevronDown, ChevronRight, Trash2 } from 'lucide-react';
 import debounce from 'lodash/debounce';
@@ -23,7 +23,7 @@ interface Group {
   collapsed?: boolean;
 }
 
-// Type for the data structure expected from diagnoses.json
+// Type for the data structure expected from the suggestions file (diagnoses.json by default)
 interface DiagnosesData {
   [groupId: string]: [string[], string[]]; // [codes, names]
 }
@@ -41,6 +41,48 @@ function isNewSaveFormat(data: any): data is SavedSessionData {
 }
 
 
+// Served by the static host from public/, resolved against Vite's `base` (see vite.config.ts).
+// Set VITE_DIAGNOSES_FILE at build time to load a different suggestions file from public/.
+const DIAGNOSES_URL = `${import.meta.env.BASE_URL}${import.meta.env.VITE_DIAGNOSES_FILE || 'diagnoses.json'}`;
+
+// Cached suggestion groups built from the suggestions file (one fetch per page load)
+let suggestedGroupsCache: Promise<Group[]> | null = null;
+
+/**
+ * Fetches the suggestions file (DIAGNOSES_URL) and converts it into suggestion groups.
+ * loadAllData only runs with a confirmed ID once per page load, so in practice the module-level cache
+ * removes the duplicate fetch from StrictMode's second effect run in development.
+ * The returned groups, their diagnoses arrays and the Diagnosis objects are shared with the suggestion
+ * state (unchanged groups are reused as-is), so callers must copy rather than mutate them.
+ * @returns The raw (unfiltered) list of suggested groups.
+ */
+function loadSuggestedGroups(): Promise<Group[]> {
+  if (!suggestedGroupsCache) {
+    suggestedGroupsCache = (async () => {
+      // Static asset: no cookies needed, so skip attaching them to the request
+      const res = await fetch(DIAGNOSES_URL, { credentials: 'omit' });
+      if (!res.ok) { const errorText = await res.text(); throw new Error(`HTTP error fetching suggestions! status: ${res.status}, message: ${errorText}, path: ${DIAGNOSES_URL}`); }
+      const data: DiagnosesData = await res.json();
+      return Object.entries(data).map(([groupId, value]: [string, [string[], string[]]], index: number) => {
+        const [codes, names] = value;
+        const diagnoses: Diagnosis[] = names.map((name: string, i: number) => {
+          // Generate stable fallback ID only if code is missing
+          const id = codes[i] ? codes[i].toString() : `generated-${groupId}-${name.toLowerCase().replace(/[^a-z0-9]/gi, '')}-${i}`;
+          return { id, name, description: '' };
+        });
+        return {
+          id: `suggested-group-${groupId}-${Date.now()}`, // ID for the suggestion container itself
+          name: `Suggested Group ${index + 1}`, // Display name
+          diagnoses, subgroups: [], collapsed: false
+        };
+      });
+    })();
+    // Mark the rejection as handled: loadAllData starts this fetch early and only awaits it (and reports errors) later
+    suggestedGroupsCache.catch(() => { /* Reported by the awaiting caller */ });
+  }
+  return suggestedGroupsCache;
+}
+
 const DiagnosisGroupingApp = (): React.JSX.Element => {
   // --- State Variables ---
   const [undoStack, setUndoStack] = useState<SavedSessionData[]>([]);
@@ -53,7 +95,6 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
   const [suggestedGroups, setSuggestedGroups] = useState<Group[]>([]); // Filtered suggested groups
   const [deletedDiagnoses, setDeletedDiagnoses] = useState<Diagnosis[]>([]); // Unsorted/deleted diagnoses
   const [totalInitialSuggestions, setTotalInitialSuggestions] = useState(0);
-  const [currentSuggestedIndex, setCurrentSuggestedIndex] = useState(0);
   const [startConfirmed, setStartConfirmed] = useState(false); // Initialize false
   const [draggedDiagnosis, setDraggedDiagnosis] = useState<Diagnosis | null>(null);
 
@@ -72,13 +113,36 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
     return [...arr].sort((a, b) => a.name.localeCompare(b.name));
   };
 
+  // Presigned S3 upload URLs by filename, reused across saves until S3 rejects one
+  const presignedUploadUrls = useRef(new Map<string, string>());
+  // Last payload sent to S3 per filename (recorded before the PUT, cleared if it fails), used to skip uploads that would not change anything
+  const lastUploadedData = useRef(new Map<string, string>());
+
+  /**
+   * Writes a local copy of the session together with the time it was written,
+   * so readLocalSession can tell whether the primary or the fallback copy is newer.
+   * @param key Which local copy to write (the S3 cache or the failed-save fallback).
+   * @param serializedData The serialized session data.
+   */
+  const writeLocalSession = (key: 'grouped_diagnoses' | 'grouped_diagnoses_fallback', serializedData: string) => {
+    localStorage.setItem(`${computingId}_${key}`, serializedData);
+    localStorage.setItem(`${computingId}_${key}_saved_at`, String(Date.now()));
+  };
+
+  /** Removes the failed-save fallback copy once S3 holds the current state. */
+  const clearLocalFallback = () => {
+    localStorage.removeItem(`${computingId}_grouped_diagnoses_fallback`);
+    localStorage.removeItem(`${computingId}_grouped_diagnoses_fallback_saved_at`);
+  };
+
   /**
    * Uploads the current state (confirmed groups and unsorted diagnoses) to S3 via a presigned URL.
    * Falls back to localStorage if API is not configured or fails.
    * @param currentGroups The current array of confirmed groups.
    * @param currentDeleted The current array of deleted/unsorted diagnoses.
+   * @param skipIfUnchanged Skip the upload if this exact state was the last one saved (auto-saves only; Save Progress always uploads).
    */
-  const uploadGroupedData = async (currentGroups: Group[], currentDeleted: Diagnosis[]) => {
+  const uploadGroupedData = async (currentGroups: Group[], currentDeleted: Diagnosis[], skipIfUnchanged = true) => {
     const dataToSave: SavedSessionData = {
         confirmedGroups: currentGroups,
         unsortedDiagnoses: currentDeleted
@@ -88,51 +152,93 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
       console.warn('Computing ID is empty, skipping S3 upload.');
       return;
     }
+    // Serialize once; the same payload goes to S3 and/or localStorage below
+    const serializedData = JSON.stringify(dataToSave);
     // Check if API_BASE_URL is the placeholder or otherwise invalid
     if (!API_BASE_URL.startsWith('https')) {
         console.warn('API_BASE_URL is not configured or invalid, skipping S3 upload.');
         // Fallback to localStorage
-        localStorage.setItem(`${computingId}_grouped_diagnoses_fallback`, JSON.stringify(dataToSave));
+        writeLocalSession('grouped_diagnoses_fallback', serializedData);
         console.log('Data saved to localStorage as fallback.');
         return;
     }
+    const filename = `${computingId}_grouped_diagnoses.json`;
+    if (skipIfUnchanged && lastUploadedData.current.get(filename) === serializedData) {
+      // This tab last sent exactly this state to S3 (e.g. an undo back to it), so skip the auto-save.
+      // An explicit Save Progress passes skipIfUnchanged = false and still uploads, in case S3 was changed from another tab.
+      // A fallback copy from a failed save in between is no longer the newest
+      clearLocalFallback();
+      console.log('No changes since last S3 save, skipping upload.');
+      return;
+    }
+    // Record this payload as sent before the PUT, so an auto-save for a different state made while this
+    // upload is in flight (e.g. an Undo) is never skipped against an older entry.
+    // Assumes uploads for one file reach S3 in the order they are sent (each PUT replaces the whole object,
+    // and the 1s debounce spaces them out), so the last payload sent is the one S3 ends up holding.
+    lastUploadedData.current.set(filename, serializedData);
     try {
       // 1. Get presigned URL for PUT operation
-      const presignedUrlResponse = await fetch(`${API_BASE_URL}/get-presigned-url`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ filename: `${computingId}_grouped_diagnoses.json`, action: 'putObject' }) // Specify action
-      });
-      if (!presignedUrlResponse.ok) {
-          let errorDetails = `Status: ${presignedUrlResponse.status}`;
-          try { const errorJson = await presignedUrlResponse.json(); errorDetails += `, Message: ${errorJson.error || errorJson.message || JSON.stringify(errorJson)}`; } catch (e) { /* Ignore */ }
-          throw new Error(`Failed to get presigned URL for upload: ${errorDetails}`);
-      }
-      const { url: presignedS3Url } = await presignedUrlResponse.json();
-      if (!presignedS3Url) throw new Error('Presigned URL for upload was not returned.');
+      const requestUploadUrl = async (): Promise<string> => {
+        const presignedUrlResponse = await fetch(`${API_BASE_URL}/get-presigned-url`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ filename, action: 'putObject' }) // Specify action
+        });
+        if (!presignedUrlResponse.ok) {
+            let errorDetails = `Status: ${presignedUrlResponse.status}`;
+            try { const errorJson = await presignedUrlResponse.json(); errorDetails += `, Message: ${errorJson.error || errorJson.message || JSON.stringify(errorJson)}`; } catch (e) { /* Ignore */ }
+            throw new Error(`Failed to get presigned URL for upload: ${errorDetails}`);
+        }
+        const { url } = await presignedUrlResponse.json();
+        if (!url) throw new Error('Presigned URL for upload was not returned.');
+        return url;
+      };
 
       // 2. PUT data to S3 using the presigned URL
-      await fetch(presignedS3Url, {
+      const putToS3 = (presignedS3Url: string) => fetch(presignedS3Url, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' }, // S3 needs this header if the data is JSON
-        body: JSON.stringify(dataToSave) // Save the combined object
+        body: serializedData // Save the combined object
       });
 
+      // Reuse the URL from the previous save when possible, saving a round trip to the API
+      const cachedUrl = presignedUploadUrls.current.get(filename);
+      let putResponse = cachedUrl ? await putToS3(cachedUrl) : null;
+      if (!putResponse?.ok) {
+        // No cached URL, or S3 rejected it (e.g. expired): request a fresh one and retry once
+        presignedUploadUrls.current.delete(filename);
+        const freshUrl = await requestUploadUrl();
+        putResponse = await putToS3(freshUrl);
+        if (!putResponse.ok) throw new Error(`S3 upload failed: Status ${putResponse.status}`);
+        presignedUploadUrls.current.set(filename, freshUrl);
+      }
+
       console.log('Data successfully auto-saved to S3.');
       // Also update local storage cache on successful S3 save
-      localStorage.setItem(`${computingId}_grouped_diagnoses`, JSON.stringify(dataToSave));
+      writeLocalSession('grouped_diagnoses', serializedData);
+      // S3 now holds this state, so any older fallback copy is stale
+      clearLocalFallback();
     } catch (error) {
       console.error('Auto-save to S3 failed:', error);
+      // S3 may not hold this payload, so don't skip the next upload against it (unless a newer upload already replaced the entry)
+      if (lastUploadedData.current.get(filename) === serializedData) lastUploadedData.current.delete(filename);
       // Fallback to localStorage on S3 error
-      localStorage.setItem(`${computingId}_grouped_diagnoses_fallback`, JSON.stringify(dataToSave));
+      writeLocalSession('grouped_diagnoses_fallback', serializedData);
       console.warn('Data saved to localStorage as a fallback due to S3 error.');
     }
   };
 
-  // Create a debounced version of the upload function
-  const debouncedUpload = useRef(debounce((currentGroups: Group[], currentDeleted: Diagnosis[]) => {
-      uploadGroupedData(currentGroups, currentDeleted);
-  }, 1000)).current; // Debounce for 1 second
+  // Points at the latest committed uploadGroupedData, so the long-lived debounced wrapper sees the current computingId.
+  // Updated in a layout effect (not during render) so a discarded render can't leave it on an uncommitted closure.
+  const uploadGroupedDataRef = useRef(uploadGroupedData);
+  useLayoutEffect(() => {
+    uploadGroupedDataRef.current = uploadGroupedData;
+  });
+
+  // Create a debounced version of the upload function once and reuse it across renders
+  const [debouncedUpload] = useState(() => debounce((currentGroups: Group[], currentDeleted: Diagnosis[], skipIfUnchanged = true) => {
+      uploadGroupedDataRef.current(currentGroups, currentDeleted, skipIfUnchanged);
+  }, 1000)); // Debounce for 1 second
 
   // --- Effects ---
 
@@ -163,16 +269,34 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
       setTotalInitialSuggestions(0);
       setDeletedDiagnoses([]); // Reset deleted list when loading for a specific ID
 
+      // Start fetching suggestions now so it overlaps with the session data requests below
+      const suggestedGroupsPromise = loadSuggestedGroups();
+
       let loadedDataFromSource: Group[] | SavedSessionData | null = null;
 
+      // Reads the locally cached session in a single try: a missing entry parses to null,
+      // and unreadable storage or corrupt JSON is treated the same as no saved data.
+      // The fallback copy is only preferred when its recorded save time is newer than the primary copy's;
+      // copies from builds that did not record save times count as 0, so an old fallback never wins over a primary copy.
+      const readLocalSession = (): Group[] | SavedSessionData | null => {
+        try {
+          const primary = localStorage.getItem(`${computingId}_grouped_diagnoses`);
+          const fallback = localStorage.getItem(`${computingId}_grouped_diagnoses_fallback`);
+          const primarySavedAt = Number(localStorage.getItem(`${computingId}_grouped_diagnoses_saved_at`)) || 0;
+          const fallbackSavedAt = Number(localStorage.getItem(`${computingId}_grouped_diagnoses_fallback_saved_at`)) || 0;
+          const preferred = fallback && (!primary || fallbackSavedAt > primarySavedAt) ? fallback : primary;
+          return JSON.parse(preferred || 'null');
+        } catch (e) {
+          console.error('Failed to read saved session data from localStorage', e);
+          return null;
+        }
+      };
+
       // --- Fetch Saved Session Data (Groups & Deleted) ---
       if (!API_BASE_URL.startsWith('https')) {
         // Handle case where API is not configured - load only from localStorage
         console.warn('API_BASE_URL is not configured or invalid. Attempting to load from localStorage only.');
-        const saved = localStorage.getItem(`${computingId}_grouped_diagnoses`) || localStorage.getItem(`${computingId}_grouped_diagnoses_fallback`);
-        if (saved) {
-          try { loadedDataFromSource = JSON.parse(saved); } catch (e) { console.error('Failed to parse saved session data from localStorage', e); loadedDataFromSource = null; }
-        }
+        loadedDataFromSource = readLocalSession();
       } else {
         // Try fetching from S3 via API Gateway
         try {
@@ -202,16 +326,17 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
                   throw new Error(`S3 data fetch failed: Status ${s3DataResponse.status}`);
               }
           } else {
-              // If S3 fetch succeeded, parse the JSON
-              loadedDataFromSource = await s3DataResponse.json();
-              // Cache successful S3 load to primary localStorage key
-              localStorage.setItem(`${computingId}_grouped_diagnoses`, JSON.stringify(loadedDataFromSource));
+              // If S3 fetch succeeded, parse the JSON (keeping the raw text)
+              const s3DataText = await s3DataResponse.text();
+              loadedDataFromSource = JSON.parse(s3DataText);
+              // Cache successful S3 load to primary localStorage key, reusing the text instead of re-serializing.
+              // This is now the state being edited, so it also becomes newer than any fallback copy.
+              writeLocalSession('grouped_diagnoses', s3DataText);
           }
         } catch (fetchError) {
           // Fallback to localStorage if S3 fetch process fails
           console.warn('S3 fetch process for session data failed, trying localStorage:', fetchError);
-          const saved = localStorage.getItem(`${computingId}_grouped_diagnoses`) || localStorage.getItem(`${computingId}_grouped_diagnoses_fallback`);
-          if (saved) try { loadedDataFromSource = JSON.parse(saved); } catch (e) { loadedDataFromSource = null; }
+          loadedDataFromSource = readLocalSession();
         }
       }
 
@@ -235,25 +360,10 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
       // --- Fetch Raw Suggested Groups ---
       let rawSuggestedGroupsList: Group[] = [];
       try {
-        const res = await fetch('/verification/diagnoses.json'); // Ensure this path is correct for your deployment
-        if (!res.ok) { const errorText = await res.text(); throw new Error(`HTTP error fetching suggestions! status: ${res.status}, message: ${errorText}, path: /verification/diagnoses.json`); }
-        const data: DiagnosesData = await res.json();
-        setTotalInitialSuggestions(Object.keys(data).length); // Set total count based on loaded suggestions
-        rawSuggestedGroupsList = Object.entries(data).map(([groupId, value]: [string, [string[], string[]]], index: number) => {
-          const [codes, names] = value;
-          const diagnoses: Diagnosis[] = names.map((name: string, i: number) => {
-            // Generate stable fallback ID if code is missing
-            const stableFallbackId = `generated-${groupId}-${name.toLowerCase().replace(/[^a-z0-9]/gi, '')}-${i}`;
-            return { id: codes[i] ? codes[i].toString() : stableFallbackId, name, description: '' };
-          });
-          return {
-            id: `suggested-group-${groupId}-${Date.now()}`, // ID for the suggestion container itself
-            name: `Suggested Group ${index + 1}`, // Display name
-            diagnoses, subgroups: [], collapsed: false
-          };
-        });
+        rawSuggestedGroupsList = await suggestedGroupsPromise; // Shared with StrictMode's second effect run in development
+        setTotalInitialSuggestions(rawSuggestedGroupsList.length); // Set total count based on loaded suggestions
       } catch (error) {
-        console.error('Failed to load or parse diagnoses.json:', error);
+        console.error(`Failed to load or parse ${DIAGNOSES_URL}:`, error);
         setTotalInitialSuggestions(0); // Reset count on error
       }
 
@@ -271,10 +381,11 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
       loadedUnsortedDiagnoses.forEach(d => diagnosisIdsToExclude.add(d.id));
 
       // Create the final list of suggestions to display
-      const filteredSuggestedGroups = rawSuggestedGroupsList.map(sg => ({
-        ...sg,
-        diagnoses: sg.diagnoses.filter(d => !diagnosisIdsToExclude.has(d.id)) // Keep only diagnoses NOT already confirmed or unsorted
-      }));
+      const filteredSuggestedGroups = rawSuggestedGroupsList.map(sg => {
+        const remainingDiagnoses = sg.diagnoses.filter(d => !diagnosisIdsToExclude.has(d.id)); // Keep only diagnoses NOT already confirmed or unsorted
+        // Share the cached group object when nothing was filtered out, rather than holding a duplicate copy
+        return remainingDiagnoses.length === sg.diagnoses.length ? sg : { ...sg, diagnoses: remainingDiagnoses };
+      });
 
       // --- Set States ---
       setGroups(sortGroupsAlphabetically(loadedConfirmedGroups)); // Set confirmed groups (sorted)
@@ -288,24 +399,16 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
 
   }, [startConfirmed, computingId]); // Re-run loadAllData if startConfirmed or computingId changes
 
-  // Effect to update the index pointing to the current suggestion to display
-  useEffect(() => {
-    // Don't calculate index if not started
-    if (!startConfirmed) {
-        setCurrentSuggestedIndex(0);
-        return;
-    }
-    // If no suggestions (either initially or after filtering), index is 0
-    if (suggestedGroups.length === 0) {
-      setCurrentSuggestedIndex(0);
-      return;
-    }
+  // Index of the current suggestion to display, derived from the suggestions list.
+  // Computed during render (not kept in state), so a change to suggestedGroups costs one render instead of two.
+  const currentSuggestedIndex = useMemo(() => {
+    // Don't calculate index if not started, or if there are no suggestions (either initially or after filtering)
+    if (!startConfirmed || suggestedGroups.length === 0) return 0;
     // Find the index of the first suggestion group that still contains diagnoses
     const nextIncompleteIndex = suggestedGroups.findIndex((sg: Group) => sg.diagnoses.length > 0);
 
-    // If found, set index to that; otherwise, set it past the end (indicates suggestions are done)
-    setCurrentSuggestedIndex(nextIncompleteIndex !== -1 ? nextIncompleteIndex : suggestedGroups.length);
-
+    // If found, use that index; otherwise, point past the end (indicates suggestions are done)
+    return nextIncompleteIndex !== -1 ? nextIncompleteIndex : suggestedGroups.length;
   }, [suggestedGroups, startConfirmed]); // Re-calculate when the filtered suggestions list changes or start state changes
 
   // --- Event Handlers & Other Functions ---
@@ -339,14 +442,15 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
     const updatedConfirmedGroups = processDropInGroups(groups, targetGroupId, draggedDiagnosis);
 
     // Remove the dropped diagnosis from the list it came from (either suggestions or deleted list)
-    const updatedSuggestedGroups = suggestedGroups.map((sg: Group) => ({
-      ...sg, diagnoses: sg.diagnoses.filter((d: Diagnosis) => d.id !== draggedDiagnosis!.id) // Use non-null assertion
-    }));
+    const updatedSuggestedGroups = suggestedGroups.map((sg: Group) => {
+      const remainingDiagnoses = sg.diagnoses.filter((d: Diagnosis) => d.id !== draggedDiagnosis!.id); // Use non-null assertion
+      return remainingDiagnoses.length === sg.diagnoses.length ? sg : { ...sg, diagnoses: remainingDiagnoses }; // Keep unchanged groups as-is
+    });
     const updatedDeletedDiagnoses = deletedDiagnoses.filter((d: Diagnosis) => d.id !== draggedDiagnosis!.id); // Use non-null assertion
 
     // Update state
     setGroups(updatedConfirmedGroups); // Note: Sorting is handled on load/add, not needed here
-    setSuggestedGroups(updatedSuggestedGroups); // This update will trigger the index useEffect
+    setSuggestedGroups(updatedSuggestedGroups); // currentSuggestedIndex is re-derived from this
     setDeletedDiagnoses(updatedDeletedDiagnoses);
     debouncedUpload(updatedConfirmedGroups, updatedDeletedDiagnoses); // Save the new state (pass both parts)
     setDraggedDiagnosis(null); // Clear the dragged item
@@ -471,15 +575,12 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
 
     const updatedGroups = removeGroupRecursive(groups); // Get the structure without the deleted group
 
-    let updatedDeletedDiagnoses: Diagnosis[] = []; // To capture the final state for debouncedUpload
-    // Add collected diagnoses to the deletedDiagnoses state, avoiding duplicates already there
-    setDeletedDiagnoses(prevDeleted => {
-        const existingDeletedIds = new Set(prevDeleted.map(d => d.id));
-        const newDiagnosesToAdd = diagnosesToMove.filter(d => !existingDeletedIds.has(d.id));
-        updatedDeletedDiagnoses = [...prevDeleted, ...newDiagnosesToAdd];
-        return updatedDeletedDiagnoses;
-    });
+    // Add collected diagnoses to the deleted list, avoiding duplicates already there.
+    // Computed here (not in a state updater, which React may run later) so the upload below gets the same list.
+    const existingDeletedIds = new Set(deletedDiagnoses.map(d => d.id));
+    const updatedDeletedDiagnoses = [...deletedDiagnoses, ...diagnosesToMove.filter(d => !existingDeletedIds.has(d.id))];
 
+    setDeletedDiagnoses(updatedDeletedDiagnoses);
     setGroups(updatedGroups); // Update confirmed groups state
     debouncedUpload(updatedGroups, updatedDeletedDiagnoses); // Save the new state
   };
@@ -571,13 +672,15 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
   }
 
   // --- Main Application Layout ---
+  // Suggestion currently on screen (undefined once all suggestions are processed); looked up once per render
+  const currentSuggestion: Group | undefined = suggestedGroups[currentSuggestedIndex];
   return (
     <div className="min-h-screen bg-gray-900 text-gray-100 p-4 md:p-6 flex flex-col">
       {/* Header Section */}
       <header className="mb-6 flex flex-wrap justify-between items-center gap-4">
         <h1 className="text-2xl md:text-3xl font-bold text-white">Diagnosis Grouping: <span className="text-blue-400">{computingId}</span></h1>
         <div className="flex gap-2 sm:gap-4 items-center">
-            <Button onClick={() => { setUndoStack(prev => [...prev.slice(-9), { confirmedGroups: groups, unsortedDiagnoses: deletedDiagnoses }]); uploadGroupedData(groups, deletedDiagnoses); setSavedMessage('Progress saved!'); setTimeout(() => setSavedMessage(''), 3000); }} className={cn("bg-green-600 hover:bg-green-700 text-sm sm:text-base")} > Save Progress </Button>
+            <Button onClick={() => { setUndoStack(prev => [...prev.slice(-9), { confirmedGroups: groups, unsortedDiagnoses: deletedDiagnoses }]); debouncedUpload(groups, deletedDiagnoses, false); debouncedUpload.flush(); /* Run now (always uploading), replacing any pending auto-save */ setSavedMessage('Progress saved!'); setTimeout(() => setSavedMessage(''), 3000); }} className={cn("bg-green-600 hover:bg-green-700 text-sm sm:text-base")} > Save Progress </Button>
             <Button onClick={handleUndo} disabled={undoStack.length === 0} className={cn("bg-yellow-500 hover:bg-yellow-600 disabled:bg-gray-500 text-sm sm:text-base")} > Undo ({undoStack.length}) </Button>
             {savedMessage && <span className="text-sm text-green-400">{savedMessage}</span>}
         </div>
@@ -600,21 +703,21 @@ const DiagnosisGroupingApp = (): React.JSX.Element => {
              {totalInitialSuggestions > 0 && !loading && ( <span className="text-sm font-normal text-gray-400 ml-2"> ({currentSuggestedIndex < suggestedGroups.length ? currentSuggestedIndex + 1 : totalInitialSuggestions} / {totalInitialSuggestions}) </span> )}
           </h2>
           {/* Conditional Rendering for Suggestions */}
-          {!loading && suggestedGroups.length > 0 && currentSuggestedIndex < suggestedGroups.length && suggestedGroups[currentSuggestedIndex] ? (
+          {!loading && currentSuggestion ? (
             <>
               {/* Suggestion Action Box */}
               <div className="mb-4 p-3 bg-gray-700 rounded-md text-white">
-                <p className="text-md font-medium mb-2"> {suggestedGroups[currentSuggestedIndex].name || `Suggestion ${currentSuggestedIndex + 1}`}: How would you like to group these? </p>
+                <p className="text-md font-medium mb-2"> {currentSuggestion.name || `Suggestion ${currentSuggestedIndex + 1}`}: How would you like to group these? </p>
                 <div className="flex gap-2 sm:gap-4">
-                  <Button onClick={() => { const currentSuggestion = suggestedGroups[currentSuggestedIndex]; if (!currentSuggestion || currentSuggestion.diagnoses.length === 0) return; const inputName = prompt('Enter a name for this new group:', currentSuggestion.name); if (!inputName || !inputName.trim()) return; const trimmedName = inputName.trim(); setUndoStack(prev => [...prev.slice(-9), { confirmedGroups: groups, unsortedDiagnoses: deletedDiagnoses }]); const existingGroup = groups.find((g: Group) => g.name.toLowerCase() === trimmedName.toLowerCase()); if (existingGroup) { const updatedGroups = groups.map((g: Group) => { if (g.id === existingGroup.id) { const diagnosesToAdd = currentSuggestion.diagnoses.filter( (sd: Diagnosis) => !g.diagnoses.some((d: Diagnosis) => d.id === sd.id) ); return { ...g, diagnoses: [...g.diagnoses, ...diagnosesToAdd] }; } return g; }); setGroups(updatedGroups); debouncedUpload(updatedGroups, deletedDiagnoses); } else { const newGroup: Group = { id: crypto.randomUUID(), name: trimmedName, diagnoses: [...currentSuggestion.diagnoses], subgroups: [], collapsed: false }; const updatedGroups = sortGroupsAlphabetically([...groups, newGroup]); setGroups(updatedGroups); debouncedUpload(updatedGroups, deletedDiagnoses); } const updatedSuggested = suggestedGroups.map((sg: Group, idx: number) => idx === currentSuggestedIndex ? { ...sg, diagnoses: [] } : sg ); setSuggestedGroups(updatedSuggested); }} className={cn("bg-blue-600 hover:bg-blue-700 text-xs sm:text-sm flex-1")} disabled={!suggestedGroups[currentSuggestedIndex]?.diagnoses || suggestedGroups[currentSuggestedIndex].diagnoses.length === 0} > Create / Merge Group </Button>
+                  <Button onClick={() => { if (!currentSuggestion || currentSuggestion.diagnoses.length === 0) return; const inputName = prompt('Enter a name for this new group:', currentSuggestion.name); if (!inputName || !inputName.trim()) return; const trimmedName = inputName.trim(); setUndoStack(prev => [...prev.slice(-9), { confirmedGroups: groups, unsortedDiagnoses: deletedDiagnoses }]); const lowerCaseName = trimmedName.toLowerCase(); const existingIndex = groups.findIndex((g: Group) => g.name.toLowerCase() === lowerCaseName); if (existingIndex !== -1) { const existingGroup = groups[existingIndex]; const existingIds = new Set(existingGroup.diagnoses.map((d: Diagnosis) => d.id)); const diagnosesToAdd = currentSuggestion.diagnoses.filter((sd: Diagnosis) => !existingIds.has(sd.id)); const updatedGroups = [...groups]; updatedGroups[existingIndex] = { ...existingGroup, diagnoses: [...existingGroup.diagnoses, ...diagnosesToAdd] }; setGroups(updatedGroups); debouncedUpload(updatedGroups, deletedDiagnoses); } else { const newGroup: Group = { id: crypto.randomUUID(), name: trimmedName, diagnoses: [...currentSuggestion.diagnoses], subgroups: [], collapsed: false }; const updatedGroups = sortGroupsAlphabetically([...groups, newGroup]); setGroups(updatedGroups); debouncedUpload(updatedGroups, deletedDiagnoses); } const updatedSuggested = suggestedGroups.map((sg: Group, idx: number) => idx === currentSuggestedIndex ? { ...sg, diagnoses: [] } : sg ); setSuggestedGroups(updatedSuggested); }} className={cn("bg-blue-600 hover:bg-blue-700 text-xs sm:text-sm flex-1")} disabled={!currentSuggestion.diagnoses || currentSuggestion.diagnoses.length === 0} > Create / Merge Group </Button>
                 </div>
                  <p className="text-xs text-gray-400 mt-2"> Or, drag them individually to your groups on the right. </p>
               </div>
               {/* List of Draggable Suggested Diagnoses */}
               <div className="space-y-2">
-                {(suggestedGroups[currentSuggestedIndex]?.diagnoses || []).map((d: Diagnosis) => ( <motion.div key={d.id} draggable onDragStart={() => handleDragStart(d)} className="bg-gray-700 rounded-md p-3 cursor-grab hover:bg-gray-600 transition-colors" layoutId={`diagnosis-${d.id}-suggested`} > <h3 className="text-sm font-medium text-gray-200">{d.name}</h3> </motion.div> ))}
+                {(currentSuggestion.diagnoses || []).map((d: Diagnosis) => ( <motion.div key={d.id} draggable onDragStart={() => handleDragStart(d)} className="bg-gray-700 rounded-md p-3 cursor-grab hover:bg-gray-600 transition-colors" layoutId={`diagnosis-${d.id}-suggested`} > <h3 className="text-sm font-medium text-gray-200">{d.name}</h3> </motion.div> ))}
               </div>
-              {suggestedGroups[currentSuggestedIndex]?.diagnoses.length > 0 && <p className="text-xs text-gray-400 mt-3">These items must be grouped before proceeding.</p> }
+              {currentSuggestion.diagnoses.length > 0 && <p className="text-xs text-gray-400 mt-3">These items must be grouped before proceeding.</p> }
             </>
           ) : null }
           {/* Conditional Rendering for Deleted/Unsorted Diagnoses */}
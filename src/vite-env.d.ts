@@ -1 +1,5 @@
 /// <reference types="vite/client" />
+
+interface ImportMetaEnv {
+  readonly VITE_DIAGNOSES_FILE?: string; // Suggestions file under public/ (defaults to diagnoses.json)
+}
@@ -1,9 +1,31 @@
 import { defineConfig } from 'vite';
 import react from '@vitejs/plugin-react';
 import path from 'node:path'; // Use Node.js built-in path module
+// Sends a caching policy for successfully served hashed build assets when running `vite preview`,
+// so repeat page loads reuse the browser's copy instead of re-validating
+const staticAssetCacheHeaders = () => ({
+    name: 'static-asset-cache-headers',
+    configurePreviewServer(server) {
+        const assetsPrefix = `${server.config.base}${server.config.build.assetsDir}/`;
+        server.middlewares.use((req, res, next) => {
+            if (req.url?.startsWith(assetsPrefix)) {
+                // Decide when the status is known (writeHead also runs for implicit headers), so a 404 for a
+                // missing asset is not cached; 304 revalidations keep the policy
+                const writeHead = res.writeHead;
+                res.writeHead = (statusCode, ...rest) => {
+                    if (statusCode === 200 || statusCode === 304) {
+                        res.setHeader('Cache-Control', 'public, max-age=3600');
+                    }
+                    return writeHead.apply(res, [statusCode, ...rest]);
+                };
+            }
+            next();
+        });
+    },
+});
 // https://vitejs.dev/config/
 export default defineConfig({
-    plugins: [react()],
+    plugins: [react(), staticAssetCacheHeaders()],
     // Define the base path for deployment (e.g., for GitHub Pages)
     // If deploying to '/verification/', keep this.
     // If deploying to the root of a custom domain, use '/' or remove it.
@@ -1,10 +1,33 @@
-import { defineConfig } from 'vite';
+import { defineConfig, type Plugin } from 'vite';
 import react from '@vitejs/plugin-react';
 import path from 'node:path'; // Use Node.js built-in path module
 
+// Sends a caching policy for successfully served hashed build assets when running `vite preview`,
+// so repeat page loads reuse the browser's copy instead of re-validating
+const staticAssetCacheHeaders = (): Plugin => ({
+  name: 'static-asset-cache-headers',
+  configurePreviewServer(server) {
+    const assetsPrefix = `${server.config.base}${server.config.build.assetsDir}/`;
+    server.middlewares.use((req, res, next) => {
+      if (req.url?.startsWith(assetsPrefix)) {
+        // Decide when the status is known (writeHead also runs for implicit headers), so a 404 for a
+        // missing asset is not cached; 304 revalidations keep the policy
+        const writeHead = res.writeHead;
+        res.writeHead = ((statusCode: number, ...rest: unknown[]) => {
+          if (statusCode === 200 || statusCode === 304) {
+            res.setHeader('Cache-Control', 'public, max-age=3600');
+          }
+          return writeHead.apply(res, [statusCode, ...rest] as Parameters<typeof writeHead>);
+        }) as typeof res.writeHead;
+      }
+      next();
+    });
+  },
+});
+
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), staticAssetCacheHeaders()],
   // Define the base path for deployment (e.g., for GitHub Pages)
   // If deploying to '/verification/', keep this.
   // If deploying to the root of a custom domain, use '/' or remove it.